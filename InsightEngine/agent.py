@@ -7,6 +7,7 @@ import json
 import os
 import re
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, Dict, Any, List, Union
 from loguru import logger
 
@@ -20,7 +21,7 @@ from .nodes import (
     ReportFormattingNode
 )
 from .state import State
-from .tools import MediaCrawlerDB, DBResponse, keyword_optimizer, multilingual_sentiment_analyzer
+from .tools import MediaCrawlerDB, DBResponse, get_keyword_optimizer, multilingual_sentiment_analyzer
 from .utils.config import settings, Settings
 from .utils import format_search_results_for_prompt
 
@@ -53,6 +54,9 @@ class DeepSearchAgent:
         # 状态
         self.state = State()
         
+        # 调用方预取的搜索结果（如按热度排好序的笔记），只替代第一个段落的初始搜索，用完即清空
+        self._prefetched_response: Optional[DBResponse] = None
+        
         # 确保输出目录存在
         os.makedirs(self.config.OUTPUT_DIR, exist_ok=True)
         
@@ -159,7 +163,7 @@ class DeepSearchAgent:
             )
         
         # 对于需要搜索词的工具，使用关键词优化中间件
-        optimized_response = keyword_optimizer.optimize_keywords(
+        optimized_response = get_keyword_optimizer().optimize_keywords(
             original_query=query,
             context=f"使用{tool_name}工具进行查询"
         )
@@ -247,6 +251,25 @@ class DeepSearchAgent:
         
         return integrated_response
     
+    @staticmethod
+    def _to_search_results(results: List) -> List[Dict[str, Any]]:
+        """把 QueryResult 列表转换为节点与提示词使用的搜索结果字典格式"""
+        return [
+            {
+                'title': result.title_or_content,
+                'url': result.url or "",
+                'content': result.title_or_content,
+                'score': result.hotness_score,
+                'raw_content': result.title_or_content,
+                'published_date': result.publish_time.isoformat() if result.publish_time else None,
+                'platform': result.platform,
+                'content_type': result.content_type,
+                'author': result.author_nickname,
+                'engagement': result.engagement
+            }
+            for result in results
+        ]
+    
     def _deduplicate_results(self, results: List) -> List:
         """
         去重搜索结果
@@ -369,17 +392,21 @@ class DeepSearchAgent:
                 "results": []
             }
     
-    def research(self, query: str, save_report: bool = True) -> str:
+    def research(self, query: str, save_report: bool = True, prefetched: Optional[DBResponse] = None) -> Dict[str, Any]:
         """
         执行深度研究
         
         Args:
             query: 研究查询
             save_report: 是否保存报告到文件
+            prefetched: 可选，预先从数据库取好的结果（如 get_top_xhs_notes 的返回值），
+                        会替代第一个段落的初始数据库搜索（同样受 MAX_SEARCH_RESULTS_FOR_LLM 限制）
             
         Returns:
-            最终报告内容
+            包含最终报告内容 content 与报告文件路径 path 的字典（未保存时 path 为 None）
         """
+        self._prefetched_response = prefetched if prefetched and prefetched.results else None
+        
         logger.info(f"\n{'='*60}")
         logger.info(f"开始深度研究: {query}")
         logger.info(f"{'='*60}")
@@ -395,12 +422,11 @@ class DeepSearchAgent:
             final_report = self._generate_final_report()
             
             # Step 4: 保存报告
-            if save_report:
-                self._save_report(final_report)
+            report_path = self._save_report(final_report) if save_report else None
 
             logger.info("深度研究完成！")
             
-            return final_report
+            return {'content': final_report, 'path': report_path}
             
         except Exception as e:
             logger.exception(f"研究过程中发生错误: {str(e)}")
@@ -516,7 +542,12 @@ class DeepSearchAgent:
                 limit = self.config.DEFAULT_SEARCH_TOPIC_ON_PLATFORM_LIMIT
             search_kwargs["limit"] = limit
         
-        search_response = self.execute_search_tool(search_tool, search_query, **search_kwargs)
+        if self._prefetched_response is not None:
+            # 预取结果只使用一次，直接替代本次数据库查询
+            logger.info("  - 使用预取的搜索结果，跳过数据库查询")
+            search_response, self._prefetched_response = self._prefetched_response, None
+        else:
+            search_response = self.execute_search_tool(search_tool, search_query, **search_kwargs)
         
         # 转换为兼容格式
         search_results = []
@@ -526,19 +557,7 @@ class DeepSearchAgent:
                 max_results = min(len(search_response.results), self.config.MAX_SEARCH_RESULTS_FOR_LLM)
             else:
                 max_results = len(search_response.results)  # 不限制，传递所有结果
-            for result in search_response.results[:max_results]:
-                search_results.append({
-                    'title': result.title_or_content,
-                    'url': result.url or "",
-                    'content': result.title_or_content,
-                    'score': result.hotness_score,
-                    'raw_content': result.title_or_content,
-                    'published_date': result.publish_time.isoformat() if result.publish_time else None,
-                    'platform': result.platform,
-                    'content_type': result.content_type,
-                    'author': result.author_nickname,
-                    'engagement': result.engagement
-                })
+            search_results = self._to_search_results(search_response.results[:max_results])
         
         if search_results:
             _message = f"  - 找到 {len(search_results)} 个搜索结果"
@@ -659,19 +678,7 @@ class DeepSearchAgent:
                     max_results = min(len(search_response.results), self.config.MAX_SEARCH_RESULTS_FOR_LLM)
                 else:
                     max_results = len(search_response.results)  # 不限制，传递所有结果
-                for result in search_response.results[:max_results]:
-                    search_results.append({
-                        'title': result.title_or_content,
-                        'url': result.url or "",
-                        'content': result.title_or_content,
-                        'score': result.hotness_score,
-                        'raw_content': result.title_or_content,
-                        'published_date': result.publish_time.isoformat() if result.publish_time else None,
-                        'platform': result.platform,
-                        'content_type': result.content_type,
-                        'author': result.author_nickname,
-                        'engagement': result.engagement
-                    })
+                search_results = self._to_search_results(search_response.results[:max_results])
             
             if search_results:
                 _message = f"    找到 {len(search_results)} 个反思搜索结果"
@@ -731,8 +738,8 @@ class DeepSearchAgent:
         logger.info("最终报告生成完成")
         return final_report
     
-    def _save_report(self, report_content: str):
-        """保存报告到文件"""
+    def _save_report(self, report_content: str) -> Path:
+        """保存报告到文件，返回报告文件路径"""
         # 生成文件名
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         query_safe = "".join(c for c in self.state.query if c.isalnum() or c in (' ', '-', '_')).rstrip()
@@ -753,6 +760,8 @@ class DeepSearchAgent:
             state_filepath = os.path.join(self.config.OUTPUT_DIR, state_filename)
             self.state.save_to_file(state_filepath)
             logger.info(f"状态已保存到: {state_filepath}")
+        
+        return Path(filepath)
     
     def get_progress_summary(self) -> Dict[str, Any]:
         """获取进度摘要"""
@@ -12,7 +12,7 @@ from .search import (
 from .keyword_optimizer import (
     KeywordOptimizer,
     KeywordOptimizationResponse,
-    keyword_optimizer
+    get_keyword_optimizer
 )
 from .sentiment_analyzer import (
     WeiboMultilingualSentimentAnalyzer,
@@ -29,7 +29,7 @@ __all__ = [
     "print_response_summary",
     "KeywordOptimizer",
     "KeywordOptimizationResponse",
-    "keyword_optimizer",
+    "get_keyword_optimizer",
     "WeiboMultilingualSentimentAnalyzer",
     "SentimentResult",
     "BatchSentimentResult",
@@ -3,12 +3,34 @@
 使用 Qwen AI 将 Agent 生成的搜索词优化为更适合「小红书品牌内容/选题分析」场景的关键词
 """
 
-from openai import OpenAI
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, RateLimitError
+import asyncio
+import atexit
+import concurrent.futures
+import hashlib
 import json
 import sys
 import os
-from typing import List, Dict, Any
-from dataclasses import dataclass
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Final, List, Dict, Any, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass, replace
+
+import httpx
+
+try:
+    import orjson as _json  # 更快的JSON解析，未安装时回退到标准库
+except ImportError:
+    import json as _json
+
+try:
+    import h2  # noqa: F401  # httpx 的 HTTP/2 支持依赖 h2（pip install "httpx[http2]"）
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # 添加项目根目录到Python路径以导入config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -22,7 +44,68 @@ utils_dir = os.path.join(root_dir, 'utils')
 if utils_dir not in sys.path:
     sys.path.append(utils_dir)
 
-from retry_helper import with_graceful_retry, SEARCH_API_RETRY_CONFIG
+from retry_helper import RetryConfig, with_graceful_retry_async, SEARCH_API_RETRY_CONFIG
+
+# 关键词优化API的重试配置：只重试网络/超时/限流/服务端错误，鉴权、参数错误等重试无益，直接走备用方案
+KEYWORD_API_RETRY_CONFIG = RetryConfig(
+    max_retries=SEARCH_API_RETRY_CONFIG.max_retries,
+    initial_delay=SEARCH_API_RETRY_CONFIG.initial_delay,
+    backoff_factor=SEARCH_API_RETRY_CONFIG.backoff_factor,
+    max_delay=SEARCH_API_RETRY_CONFIG.max_delay,
+    retry_on_exceptions=(APIConnectionError, RateLimitError, InternalServerError),
+)
+
+# 备用关键词提取用到的正则，模块加载时编译一次
+_QUOTED_RE = re.compile(r'["""\'](.*?)["""\']')
+_QUERY_SPLIT_RE = re.compile(r'[\s，。！？；：、]+')
+
+# 不良关键词（过于专业或官方），包含其中任意一个词的关键词会被过滤
+BAD_KEYWORDS = (
+    '态度分析', '公众反应', '情绪倾向',
+    '未来展望', '发展趋势', '战略规划', '政策导向', '管理机制'
+)
+_BAD_KEYWORD_RE = re.compile("|".join(map(re.escape, BAD_KEYWORDS)))
+
+# 系统 prompt（品牌/小红书场景）：每次请求逐字节相同，便于服务端复用提示词前缀缓存；
+# 查询与上下文等动态内容只放在 user 消息中，不要拼进这里
+_SYSTEM_PROMPT: Final[str] = """你是一位专业的「小红书品牌内容与选题分析」数据挖掘专家。
+你的任务是将用户提供的搜索查询优化为更适合在小红书品牌内容数据库中查找的关键词。
+
+**核心原则**：
+1. **贴近小红书用户语言**：使用普通博主/用户在小红书标题、标签、搜索栏中会真实使用的词汇
+2. **避免官方/学术术语**：不使用「舆情」「传播」「倾向」「展望」「发展趋势」等研究型词汇
+3. **简洁具体**：每个关键词要简洁明了，便于在标题/标签/搜索中直接使用
+4. **围绕品牌/品类场景**：结合品牌名/产品名 + 场景/功效/人群/价格带等维度
+5. **数量控制**：最少提供 8 个关键词，最多提供 20 个关键词
+6. **避免跑题**：不要脱离初始查询的品牌、品类或核心需求
+
+**重要提醒**：
+- 每个关键词都必须是一个不可分割的独立词条，严禁在词条内部包含空格；
+- 例如，应使用「雪花秀润燥精华」「秋冬干皮粉底」而不是「雪花秀 润燥 精华」。
+
+**输出格式**：
+请以 JSON 格式返回结果：
+{
+    "keywords": ["关键词1", "关键词2", "关键词3"],
+    "reasoning": "选择这些关键词的理由（用中文简要说明）"
+}
+
+**示例（仅示意，不要照搬具体词）**：
+输入："雪花秀精华 学生党 干皮 适合吗"
+输出：
+{
+    "keywords": [
+        "雪花秀精华",
+        "雪花秀润燥精华",
+        "雪花秀精华干皮",
+        "雪花秀精华学生党",
+        "干皮精华推荐",
+        "学生党护肤",
+        "秋冬干皮精华",
+        "韩系精华推荐"
+    ],
+    "reasoning": "优先保留品牌和明星单品名称，同时加入典型人群（学生党）、肤质（干皮）、季节（秋冬）等维度，便于在小红书中覆盖更多真实搜索场景。"
+}"""
 
 @dataclass
 class KeywordOptimizationResponse:
@@ -33,6 +116,129 @@ class KeywordOptimizationResponse:
     success: bool
     error_message: str = ""
 
+class KeywordResponseCache:
+    """关键词优化结果缓存
+
+    两级结构：
+    1. 精确缓存：以 (模型, 系统prompt, 用户prompt, temperature) 的 SHA-256 为键；
+    2. 语义缓存：对原始查询做向量化，余弦相似度达到阈值且上下文完全一致时复用结果，
+       上下文必须一致是为了避免「查询相似但使用场景不同」时的误命中。
+
+    语义层依赖 sentence-transformers，仅在配置了模型名称时按需加载，
+    未安装或加载失败时自动退化为仅精确缓存。模型加载与编码都是阻塞的 CPU 操作，
+    调用方应在事件循环之外调用 embed，并把得到的向量传给 get_similar / put 复用。
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        max_entries: int = 512,
+        semantic_model: Optional[str] = None,
+        similarity_threshold: float = 0.92,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.semantic_model = semantic_model
+        self.similarity_threshold = similarity_threshold
+
+        self._exact: "OrderedDict[str, Tuple[float, KeywordOptimizationResponse]]" = OrderedDict()
+
+        # 语义层：归一化后的查询向量矩阵 (N, d)，与 _semantic_entries 按行一一对应
+        self._embedder = None
+        self._embed_lock = threading.Lock()
+        self._embeddings = None
+        self._semantic_entries: List[Tuple[str, float, KeywordOptimizationResponse]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.enabled and bool(self.semantic_model)
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, user_prompt: str, temperature: float) -> str:
+        payload = json.dumps(
+            {"m": model, "s": system_prompt, "u": user_prompt, "t": temperature},
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at < self.ttl_seconds
+
+    def get(self, key: str) -> Optional[KeywordOptimizationResponse]:
+        """精确缓存查找"""
+        if not self.enabled:
+            return None
+        entry = self._exact.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if not self._is_fresh(stored_at):
+            del self._exact[key]
+            return None
+        self._exact.move_to_end(key)
+        return response
+
+    def get_similar(self, vector, context: str) -> Optional[KeywordOptimizationResponse]:
+        """语义缓存查找：返回上下文一致且相似度最高（且达到阈值）的缓存结果
+
+        Args:
+            vector: embed 返回的查询向量，为 None 时直接视为未命中
+            context: 查询的上下文，必须与缓存条目完全一致
+        """
+        if not self.enabled or vector is None or self._embeddings is None or not self._semantic_entries:
+            return None
+
+        scores = self._embeddings @ vector
+        for idx in scores.argsort()[::-1]:
+            if scores[idx] < self.similarity_threshold:
+                break
+            cached_context, stored_at, response = self._semantic_entries[idx]
+            if cached_context == context and self._is_fresh(stored_at):
+                return response
+        return None
+
+    def put(self, key: str, context: str, response: KeywordOptimizationResponse, vector=None) -> None:
+        """写入精确缓存；提供了查询向量时同时写入语义缓存"""
+        if not self.enabled:
+            return
+        now = time.time()
+        self._exact[key] = (now, response)
+        self._exact.move_to_end(key)
+        while len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+
+        if vector is None:
+            return
+        import numpy as np
+
+        row = vector.reshape(1, -1)
+        self._embeddings = row if self._embeddings is None else np.vstack([self._embeddings, row])
+        self._semantic_entries.append((context, now, response))
+        overflow = len(self._semantic_entries) - self.max_entries
+        if overflow > 0:
+            self._embeddings = self._embeddings[overflow:]
+            self._semantic_entries = self._semantic_entries[overflow:]
+
+    def embed(self, text: str):
+        """把查询编码为归一化的 float32 向量；语义层不可用时返回 None（阻塞调用，可在工作线程中执行）"""
+        with self._embed_lock:
+            if not self.semantic_model:
+                return None
+            if self._embedder is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    self._embedder = SentenceTransformer(self.semantic_model)
+                except Exception as e:
+                    logger.warning(f"语义缓存模型加载失败，仅使用精确缓存: {e}")
+                    self.semantic_model = None
+                    return None
+            return self._embedder.encode(text, normalize_embeddings=True).astype("float32")
+
 class KeywordOptimizer:
     """关键词优化器
 
@@ -40,13 +246,25 @@ class KeywordOptimizer:
     「小红书品牌内容/选题分析」场景的检索关键词。
     """
     
-    def __init__(self, api_key: str = None, base_url: str = None, model_name: str = None):
+    # 调用Qwen时使用的采样温度（同时参与缓存键计算）；较低的温度输出更稳定，也更容易命中缓存
+    TEMPERATURE = 0.2
+    # 8~20个关键词加一段简短理由用不了这么多token，限制输出长度以免模型生成过长拖慢响应
+    MAX_TOKENS = 400
+
+    # 用户prompt中固定不变的部分
+    _USER_PROMPT_HEADER = "请将以下搜索查询优化为适合 '小红书品牌内容/选题分析' 场景的关键词：\n\n原始查询："
+    _USER_PROMPT_CONTEXT = "\n\n上下文信息："
+    _USER_PROMPT_FOOTER = "\n\n请记住：要使用小红书用户在标题/标签/搜索中真实会用的词汇，避免官方术语和学术化表达。"
+
+    def __init__(self, api_key: str = None, base_url: str = None, model_name: str = None,
+                 max_concurrency: int = 8):
         """
         初始化关键词优化器
         
         Args:
             api_key: 硅基流动API密钥，如果不提供则从配置文件读取
             base_url: 接口基础地址，默认使用配置文件提供的SiliconFlow地址
+            max_concurrency: 批量优化时同时在途的API请求上限，避免触发服务端限流
         """
         self.api_key = api_key or settings.KEYWORD_OPTIMIZER_API_KEY
 
@@ -55,15 +273,36 @@ class KeywordOptimizer:
 
         self.base_url = base_url or settings.KEYWORD_OPTIMIZER_BASE_URL
 
-        self.client = OpenAI(
+        # 所有请求复用同一个连接池；启用 HTTP/2 时并发请求在同一条TLS连接上多路复用，
+        # 省去每个并发请求各自建连/握手的开销
+        self._http = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+        self.client = AsyncOpenAI(
             api_key=self.api_key,
-            base_url=self.base_url
+            base_url=self.base_url,
+            http_client=self._http
         )
         self.model = model_name or settings.KEYWORD_OPTIMIZER_MODEL_NAME
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = KeywordResponseCache(
+            ttl_seconds=settings.KEYWORD_OPTIMIZER_CACHE_TTL,
+            semantic_model=settings.KEYWORD_OPTIMIZER_SEMANTIC_CACHE_MODEL,
+        )
+
+        # 优化器专属的后台事件循环（常驻守护线程）：AsyncOpenAI 的连接池绑定在建立连接时的
+        # 事件循环上，所有请求都提交到同一个循环，才能共享 keep-alive 连接，
+        # 且多个线程同时调用共享实例时也不会互相冲突
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        # 在途请求：缓存键 -> 等待API结果的Future（仅在后台事件循环内读写）
+        self._inflight: Dict[str, asyncio.Future] = {}
     
     def optimize_keywords(self, original_query: str, context: str = "") -> KeywordOptimizationResponse:
         """
-        优化搜索关键词
+        优化搜索关键词（同步入口，兼容旧调用方）
         
         Args:
             original_query: Agent生成的原始搜索查询
@@ -72,69 +311,111 @@ class KeywordOptimizer:
         Returns:
             KeywordOptimizationResponse: 优化后的关键词列表
         """
+        return self._submit(self._optimize_one(original_query, context)).result()
+
+    async def optimize_keywords_batch(
+        self,
+        queries: Sequence[Union[str, Tuple[str, str]]]
+    ) -> List[KeywordOptimizationResponse]:
+        """
+        并发优化一批搜索查询，总耗时约等于最慢的一次API调用而非所有调用之和
+
+        Args:
+            queries: 查询列表，元素可以是原始查询字符串，也可以是 (原始查询, 上下文) 二元组
+
+        Returns:
+            List[KeywordOptimizationResponse]: 与输入顺序一一对应的优化结果
+        """
+        normalized = [(q, "") if isinstance(q, str) else (q[0], q[1]) for q in queries]
+        return await asyncio.wrap_future(self._submit(self._gather_bounded(normalized)))
+
+    async def _gather_bounded(self, queries: List[Tuple[str, str]]) -> List[KeywordOptimizationResponse]:
+        """在后台事件循环中并发执行，同时在途的请求数不超过 max_concurrency"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _bounded(original_query: str, context: str) -> KeywordOptimizationResponse:
+            async with semaphore:
+                return await self._optimize_one(original_query, context)
+
+        return list(await asyncio.gather(*[_bounded(q, ctx) for q, ctx in queries]))
+
+    def _submit(self, coro) -> concurrent.futures.Future:
+        """把协程提交到优化器的后台事件循环，首次调用时启动该循环"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="keyword-optimizer-loop",
+                    daemon=True,
+                ).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def aclose(self) -> None:
+        """关闭底层HTTP连接池"""
+        await asyncio.wrap_future(self._submit(self._http.aclose()))
+
+    def close(self) -> None:
+        """关闭底层HTTP连接池并停止后台事件循环（进程退出时自动调用）"""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._http.aclose(), loop).result(timeout=5)
+        except Exception as e:
+            logger.warning(f"关闭关键词优化器连接池失败: {str(e)}")
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+
+    async def _optimize_one(self, original_query: str, context: str = "") -> KeywordOptimizationResponse:
+        """优化单条搜索查询（协程实现，供同步入口与批量入口共用）"""
         logger.info(f"🔍 关键词优化中间件: 处理查询 '{original_query}'")
         
         try:
             # 构建优化prompt
-            system_prompt = self._build_system_prompt()
+            system_prompt = _SYSTEM_PROMPT
             user_prompt = self._build_user_prompt(original_query, context)
+
+            # 先查缓存：精确命中优先，其次是上下文一致的语义近似查询
+            cache_key = self.cache.make_key(self.model, system_prompt, user_prompt, self.TEMPERATURE)
+            cached = self.cache.get(cache_key)
+            vector = None
+            if cached is None and self.cache.semantic_enabled:
+                # 向量化放到工作线程，避免模型加载/编码阻塞后台事件循环上的其他在途请求；
+                # 同一个向量在未命中时继续用于写入缓存，每条查询只编码一次
+                vector = await asyncio.to_thread(self.cache.embed, original_query)
+                cached = self.cache.get_similar(vector, context)
+            if cached is not None:
+                logger.info(f"♻️ 命中关键词缓存: {len(cached.optimized_keywords)}个关键词")
+                return replace(cached, original_query=original_query)
             
-            # 调用Qwen API
-            response = self._call_qwen_api(system_prompt, user_prompt)
-            
-            if response["success"]:
-                # 解析响应
-                content = response["content"]
-                try:
-                    # 尝试解析JSON格式的响应
-                    if content.strip().startswith('{'):
-                        parsed = json.loads(content)
-                        keywords = parsed.get("keywords", [])
-                        reasoning = parsed.get("reasoning", "")
-                    else:
-                        # 如果不是JSON格式，尝试从文本中提取关键词
-                        keywords = self._extract_keywords_from_text(content)
-                        reasoning = content
-                    
-                    # 验证关键词质量
-                    validated_keywords = self._validate_keywords(keywords)
-                    
-                    logger.info(
-                        f"✅ 优化成功: {len(validated_keywords)}个关键词" +
-                        ("" if not validated_keywords else "\n" +
-                         "\n".join([f"   {i}. '{k}'" for i, k in enumerate(validated_keywords, 1)]))
-                    )
-                        
-                    
-                    
-                    return KeywordOptimizationResponse(
-                        original_query=original_query,
-                        optimized_keywords=validated_keywords,
-                        reasoning=reasoning,
-                        success=True
-                    )
-                
-                except Exception as e:
-                    logger.exception(f"⚠️ 解析响应失败，使用备用方案: {str(e)}")
-                    # 备用方案：从原始查询中提取关键词
-                    fallback_keywords = self._fallback_keyword_extraction(original_query)
-                    return KeywordOptimizationResponse(
-                        original_query=original_query,
-                        optimized_keywords=fallback_keywords,
-                        reasoning="API响应解析失败，使用备用关键词提取",
-                        success=True
-                    )
-            else:
-                logger.error(f"❌ API调用失败: {response['error']}")
-                # 使用备用方案
-                fallback_keywords = self._fallback_keyword_extraction(original_query)
-                return KeywordOptimizationResponse(
-                    original_query=original_query,
-                    optimized_keywords=fallback_keywords,
-                    reasoning="API调用失败，使用备用关键词提取",
-                    success=True,
-                    error_message=response['error']
+            # 单飞：同一键已有在途请求时直接等待其结果，避免同批重复查询各打一次API
+            inflight = self._inflight.get(cache_key)
+            if inflight is not None:
+                return await asyncio.shield(inflight)
+
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[cache_key] = future
+            try:
+                result = await self._request_keywords(
+                    original_query, context, system_prompt, user_prompt, cache_key, vector
                 )
+            except asyncio.CancelledError:
+                # 只取消发起请求的任务本身：给等待者一个普通异常，让它们走备用方案，
+                # 而不是把 CancelledError 传播给并未被取消的任务
+                future.set_exception(RuntimeError("在途的关键词优化请求已被取消"))
+                future.exception()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                future.exception()  # 异常由本协程抛出，避免无人等待时的告警
+                raise
+            else:
+                future.set_result(result)
+                return result
+            finally:
+                del self._inflight[cache_key]
                 
         except Exception as e:
             logger.error(f"❌ 关键词优化失败: {str(e)}")
@@ -148,81 +429,104 @@ class KeywordOptimizer:
                 error_message=str(e)
             )
     
-    def _build_system_prompt(self) -> str:
-        """构建系统 prompt（品牌/小红书场景）"""
-        return """你是一位专业的「小红书品牌内容与选题分析」数据挖掘专家。
-你的任务是将用户提供的搜索查询优化为更适合在小红书品牌内容数据库中查找的关键词。
-
-**核心原则**：
-1. **贴近小红书用户语言**：使用普通博主/用户在小红书标题、标签、搜索栏中会真实使用的词汇
-2. **避免官方/学术术语**：不使用「舆情」「传播」「倾向」「展望」「发展趋势」等研究型词汇
-3. **简洁具体**：每个关键词要简洁明了，便于在标题/标签/搜索中直接使用
-4. **围绕品牌/品类场景**：结合品牌名/产品名 + 场景/功效/人群/价格带等维度
-5. **数量控制**：最少提供 8 个关键词，最多提供 20 个关键词
-6. **避免跑题**：不要脱离初始查询的品牌、品类或核心需求
-
-**重要提醒**：
-- 每个关键词都必须是一个不可分割的独立词条，严禁在词条内部包含空格；
-- 例如，应使用「雪花秀润燥精华」「秋冬干皮粉底」而不是「雪花秀 润燥 精华」。
-
-**输出格式**：
-请以 JSON 格式返回结果：
-{
-    "keywords": ["关键词1", "关键词2", "关键词3"],
-    "reasoning": "选择这些关键词的理由（用中文简要说明）"
-}
-
-**示例（仅示意，不要照搬具体词）**：
-输入："雪花秀精华 学生党 干皮 适合吗"
-输出：
-{
-    "keywords": [
-        "雪花秀精华",
-        "雪花秀润燥精华",
-        "雪花秀精华干皮",
-        "雪花秀精华学生党",
-        "干皮精华推荐",
-        "学生党护肤",
-        "秋冬干皮精华",
-        "韩系精华推荐"
-    ],
-    "reasoning": "优先保留品牌和明星单品名称，同时加入典型人群（学生党）、肤质（干皮）、季节（秋冬）等维度，便于在小红书中覆盖更多真实搜索场景。"
-}"""
+    async def _request_keywords(
+        self,
+        original_query: str,
+        context: str,
+        system_prompt: str,
+        user_prompt: str,
+        cache_key: str,
+        vector=None
+    ) -> KeywordOptimizationResponse:
+        """调用API并解析出关键词，成功时写入缓存（vector 为查询向量，用于语义缓存）"""
+        # 调用Qwen API
+        response = await self._call_qwen_api(system_prompt, user_prompt)
+        
+        if response["success"]:
+            # 解析响应
+            content = response["content"]
+            try:
+                # 尝试解析JSON格式的响应
+                if content.strip().startswith('{'):
+                    parsed = _json.loads(content)
+                    keywords = parsed.get("keywords", [])
+                    reasoning = parsed.get("reasoning", "")
+                else:
+                    # 如果不是JSON格式，尝试从文本中提取关键词
+                    keywords = self._extract_keywords_from_text(content)
+                    reasoning = content
+                
+                # 验证关键词质量
+                validated_keywords = self._validate_keywords(keywords)
+                
+                logger.info(
+                    f"✅ 优化成功: {len(validated_keywords)}个关键词" +
+                    ("" if not validated_keywords else "\n" +
+                     "\n".join([f"   {i}. '{k}'" for i, k in enumerate(validated_keywords, 1)]))
+                )
+                    
+                
+                
+                result = KeywordOptimizationResponse(
+                    original_query=original_query,
+                    optimized_keywords=validated_keywords,
+                    reasoning=reasoning,
+                    success=True
+                )
+                if validated_keywords:
+                    self.cache.put(cache_key, context, result, vector)
+                return result
+            
+            except Exception as e:
+                logger.exception(f"⚠️ 解析响应失败，使用备用方案: {str(e)}")
+                # 备用方案：从原始查询中提取关键词
+                fallback_keywords = self._fallback_keyword_extraction(original_query)
+                return KeywordOptimizationResponse(
+                    original_query=original_query,
+                    optimized_keywords=fallback_keywords,
+                    reasoning="API响应解析失败，使用备用关键词提取",
+                    success=True
+                )
+        else:
+            logger.error(f"❌ API调用失败: {response['error']}")
+            # 使用备用方案
+            fallback_keywords = self._fallback_keyword_extraction(original_query)
+            return KeywordOptimizationResponse(
+                original_query=original_query,
+                optimized_keywords=fallback_keywords,
+                reasoning="API调用失败，使用备用关键词提取",
+                success=True,
+                error_message=response['error']
+            )
 
     def _build_user_prompt(self, original_query: str, context: str) -> str:
-        """构建用户prompt"""
-        prompt = (
-            "请将以下搜索查询优化为适合 '小红书品牌内容/选题分析' 场景的关键词："
-            f"\n\n原始查询：{original_query}"
-        )
-        
+        """构建用户prompt（固定的头尾文本预先定义为类常量，只替换查询与上下文）"""
         if context:
-            prompt += f"\n\n上下文信息：{context}"
-        
-        prompt += "\n\n请记住：要使用小红书用户在标题/标签/搜索中真实会用的词汇，避免官方术语和学术化表达。"
-        
-        return prompt
-    
-    @with_graceful_retry(SEARCH_API_RETRY_CONFIG, default_return={"success": False, "error": "关键词优化服务暂时不可用"})
-    def _call_qwen_api(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
-        """调用Qwen API"""
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
+            return (
+                f"{self._USER_PROMPT_HEADER}{original_query}"
+                f"{self._USER_PROMPT_CONTEXT}{context}{self._USER_PROMPT_FOOTER}"
             )
+        return f"{self._USER_PROMPT_HEADER}{original_query}{self._USER_PROMPT_FOOTER}"
+    
+    @with_graceful_retry_async(KEYWORD_API_RETRY_CONFIG, default_return={"success": False, "error": "关键词优化服务暂时不可用"})
+    async def _call_qwen_api(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        """调用Qwen API（异常交给重试装饰器处理，重试耗尽或不可重试时返回其默认值）"""
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=self.TEMPERATURE,
+            max_tokens=self.MAX_TOKENS,
+            # JSON模式：直接返回合法JSON，常规情况下无需再走文本提取的兜底逻辑
+            response_format={"type": "json_object"},
+        )
 
-            if response.choices:
-                content = response.choices[0].message.content
-                return {"success": True, "content": content}
-            else:
-                return {"success": False, "error": "API返回格式异常"}
-        except Exception as e:
-            return {"success": False, "error": f"API调用异常: {str(e)}"}
+        if response.choices:
+            content = response.choices[0].message.content
+            return {"success": True, "content": content}
+        return {"success": False, "error": "API返回格式异常"}
     
     def _extract_keywords_from_text(self, text: str) -> List[str]:
         """从文本中提取关键词（当JSON解析失败时使用）"""
@@ -248,8 +552,7 @@ class KeywordOptimizer:
         # 如果没有找到，尝试其他方法
         if not keywords:
             # 查找引号中的内容
-            import re
-            quoted_content = re.findall(r'["""\'](.*?)["""\']', text)
+            quoted_content = _QUOTED_RE.findall(text)
             keywords.extend(quoted_content)
         
         # 清理和验证关键词
@@ -265,12 +568,6 @@ class KeywordOptimizer:
         """验证和清理关键词"""
         validated = []
         
-        # 不良关键词（过于专业或官方）
-        bad_keywords = {
-            '态度分析', '公众反应', '情绪倾向',
-            '未来展望', '发展趋势', '战略规划', '政策导向', '管理机制'
-        }
-        
         for keyword in keywords:
             if isinstance(keyword, str):
                 keyword = keyword.strip().strip('"\'""''')
@@ -279,7 +576,7 @@ class KeywordOptimizer:
                 if (keyword and 
                     len(keyword) <= 20 and 
                     len(keyword) >= 1 and
-                    not any(bad_word in keyword for bad_word in bad_keywords)):
+                    not _BAD_KEYWORD_RE.search(keyword)):
                     validated.append(keyword)
         
         return validated[:20]  # 最多返回20个关键词
@@ -290,10 +587,8 @@ class KeywordOptimizer:
         # 移除常见的无用词汇
         stop_words = {'、'}
         
-        # 分割查询
-        import re
-        # 按空格、标点分割
-        tokens = re.split(r'[\s，。！？；：、]+', original_query)
+        # 分割查询（按空格、标点分割）
+        tokens = _QUERY_SPLIT_RE.split(original_query)
         
         keywords = []
         for token in tokens:
@@ -308,5 +603,17 @@ class KeywordOptimizer:
         
         return keywords[:20]
 
-# 全局实例
-keyword_optimizer = KeywordOptimizer()
+# 全局实例（延迟创建：导入本模块时不初始化API客户端，也不要求已配置密钥）
+_keyword_optimizer: Optional[KeywordOptimizer] = None
+_keyword_optimizer_lock = threading.Lock()
+
+
+def get_keyword_optimizer() -> KeywordOptimizer:
+    """获取全局共享的关键词优化器，首次调用时创建"""
+    global _keyword_optimizer
+    if _keyword_optimizer is None:
+        with _keyword_optimizer_lock:
+            if _keyword_optimizer is None:
+                _keyword_optimizer = KeywordOptimizer()
+                atexit.register(_keyword_optimizer.close)
+    return _keyword_optimizer
@@ -69,6 +69,10 @@ class MediaCrawlerDB:
     W_VIEW = 0.1
     W_DANMAKU = 0.5
 
+    # 小红书笔记综合热度的 SQL 模板（search_hot_content 与 get_top_xhs_notes 共用），
+    # 计数列占位符由 _xhs_note_hotness_sql 按数据库方言替换为整数转换表达式
+    XHS_NOTE_HOTNESS_SQL = f"(COALESCE({{liked_count}}, 0) * {W_LIKE} + COALESCE({{comment_count}}, 0) * {W_COMMENT} + COALESCE({{share_count}}, 0) * {W_SHARE} + COALESCE({{collected_count}}, 0) * {W_SHARE})"
+
     def __init__(self):
         """
         初始化客户端。
@@ -153,7 +157,7 @@ class MediaCrawlerDB:
             'bilibili_video': f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(video_comment AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(video_share_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(video_favorite_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(video_coin_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(video_danmaku AS UNSIGNED), 0) * {self.W_DANMAKU} + COALESCE(CAST(video_play_count AS DECIMAL(20,2)), 0) * {self.W_VIEW})",
             'douyin_aweme':   f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comment_count AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(share_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(collected_count AS UNSIGNED), 0) * {self.W_SHARE})",
             'weibo_note':     f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comments_count AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(shared_count AS UNSIGNED), 0) * {self.W_SHARE})",
-            'xhs_note':       f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comment_count AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(share_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(collected_count AS UNSIGNED), 0) * {self.W_SHARE})",
+            'xhs_note':       self._xhs_note_hotness_sql(),
             'kuaishou_video': f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(viewd_count AS DECIMAL(20,2)), 0) * {self.W_VIEW})",
             'zhihu_content':  f"(COALESCE(CAST(voteup_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comment_count AS UNSIGNED), 0) * {self.W_COMMENT})",
         }
@@ -184,6 +188,44 @@ class MediaCrawlerDB:
         formatted_results = [QueryResult(platform=r['p'], content_type=r['t'], title_or_content=r['title'], author_nickname=r.get('author'), url=r['url'], publish_time=self._to_datetime(r['ts']), engagement=self._extract_engagement(r), hotness_score=r.get('hotness_score', 0.0), source_keyword=r.get('source_keyword'), source_table=r['tbl']) for r in raw_results]
         return DBResponse("search_hot_content", params_for_log, results=formatted_results, results_count=len(formatted_results))    
 
+    def get_top_xhs_notes(self, keyword: str, limit: int = 50) -> DBResponse:
+        """
+        【预取】按综合热度获取某来源关键词下排名前 limit 的小红书笔记，排序与截断均在数据库端完成。
+
+        Args:
+            keyword (str): 来源关键词，按 source_keyword 前缀匹配。
+            limit (int): 返回的最大笔记数，默认为 50。
+
+        Returns:
+            DBResponse: 按热度降序排列的笔记列表。
+        """
+        params_for_log = {'keyword': keyword, 'limit': limit}
+        logger.info(f"--- TOOL: 预取高热度小红书笔记 (params: {params_for_log}) ---")
+
+        hotness_formula = self._xhs_note_hotness_sql()
+        query = (
+            f"SELECT title, {self._wrap_query_field_with_dialect('desc')}, nickname, note_url, time, liked_count, collected_count, comment_count, share_count, source_keyword, "
+            f"{hotness_formula} AS hotness_score FROM xhs_note WHERE source_keyword LIKE :keyword "
+            "ORDER BY hotness_score DESC LIMIT :limit"
+        )
+        raw_results = self._execute_query(query, {'keyword': f"{keyword}%", 'limit': limit})
+
+        formatted_results = [QueryResult(platform='xhs', content_type='note', title_or_content=r.get('title') or r.get('desc') or '', author_nickname=r.get('nickname'), url=r.get('note_url'), publish_time=self._to_datetime(r.get('time')), engagement=self._extract_engagement(r), hotness_score=float(r.get('hotness_score') or 0.0), source_keyword=r.get('source_keyword'), source_table='xhs_note') for r in raw_results]
+        return DBResponse("get_top_xhs_notes", params_for_log, results=formatted_results, results_count=len(formatted_results))
+
+    def _cast_count_with_dialect(self, column: str) -> str:
+        """根据数据库方言把文本计数列转换为整数（PostgreSQL 没有 UNSIGNED，且非数字文本会直接报错，故只转换纯数字）"""
+        if settings.DB_DIALECT == 'postgresql':
+            return f"CASE WHEN {column} ~ '^[0-9]+$' THEN CAST({column} AS BIGINT) END"
+        return f"CAST({column} AS UNSIGNED)"
+
+    def _xhs_note_hotness_sql(self) -> str:
+        """按当前数据库方言生成小红书笔记的综合热度 SQL 片段"""
+        return self.XHS_NOTE_HOTNESS_SQL.format(**{
+            column: self._cast_count_with_dialect(column)
+            for column in ('liked_count', 'comment_count', 'share_count', 'collected_count')
+        })
+
     def _wrap_query_field_with_dialect(self, field: str) -> str:
         """根据数据库方言包装SQL查询"""
         if settings.DB_DIALECT == 'postgresql':
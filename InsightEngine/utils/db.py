@@ -9,16 +9,18 @@
 from __future__ import annotations
 from urllib.parse import quote_plus
 import asyncio
+import functools
 import os
 from typing import Any, Dict, Iterable, List, Optional, Union
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
-from sqlalchemy import text
+from sqlalchemy import text, TextClause
 from InsightEngine.utils.config import settings
 
 __all__ = [
     "get_async_engine",
     "fetch_all",
+    "ping",
 ]
 
 
@@ -50,23 +52,43 @@ def get_async_engine() -> AsyncEngine:
     global _engine
     if _engine is None:
         database_url: str = _build_database_url()
+        # 进程内共享一个长连接池：常驻 DB_POOL_SIZE 个连接，峰值时最多再扩 DB_MAX_OVERFLOW 个，
+        # 各次查询只从池中借还连接，不再重复建连/认证
         _engine = create_async_engine(
             database_url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
             pool_pre_ping=True,
             pool_recycle=1800,
         )
     return _engine
 
 
+@functools.lru_cache(maxsize=256)
+def _prepared(query: str) -> TextClause:
+    """
+    按 SQL 文本缓存 TextClause，同一条 SQL 只做一次 :name 绑定参数的解析。
+    SQLAlchemy 的编译缓存与 asyncpg 的预编译语句缓存本就按 SQL 文本命中，与是否复用该对象无关。
+    """
+    return text(query)
+
+
 async def fetch_all(query: str, params: Optional[Union[Iterable[Any], Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
     """
     执行只读查询并返回字典列表。
     """
     engine: AsyncEngine = get_async_engine()
     async with engine.connect() as conn:
-        result = await conn.execute(text(query), params or {})
+        result = await conn.execute(_prepared(query), params or {})
         rows = result.mappings().all()
         # 将 RowMapping 转换为普通字典
         return [dict(row) for row in rows]
 
 
+async def ping() -> bool:
+    """
+    检查数据库连通性：从连接池借出一个连接并做一次驱动级 ping（如 MySQL 的 COM_PING），不解析任何 SQL。
+    """
+    engine: AsyncEngine = get_async_engine()
+    async with engine.connect() as conn:
+        return await conn.run_sync(lambda sync_conn: sync_conn.dialect.do_ping(sync_conn.connection.dbapi_connection))
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, Text, String, BigInteger
+from sqlalchemy import create_engine, Column, Integer, Text, String, BigInteger, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -290,6 +290,16 @@ class XhsNote(Base):
     source_keyword = Column(Text, default='')
     xsec_token = Column(Text)
 
+    # TEXT 列在 MySQL 上建索引需要指定前缀长度；PostgreSQL 非 C 排序规则下，
+    # 普通 btree 索引无法用于 LIKE '关键词%'，需要使用 text_pattern_ops
+    __table_args__ = (
+        Index(
+            'idx_xhs_note_source_keyword', 'source_keyword',
+            mysql_length=255,
+            postgresql_ops={'source_keyword': 'text_pattern_ops'},
+        ),
+    )
+
 class XhsNoteComment(Base):
     __tablename__ = 'xhs_note_comment'
     id = Column(Integer, primary_key=True)
@@ -38,13 +38,24 @@ import argparse
 import asyncio
 import time
 from pathlib import Path
+from typing import Callable, Iterable
 
 import pandas as pd
 from loguru import logger
+from sqlalchemy import insert
 
 from database.db_session import create_tables_without_creating_database, get_session
 from database.models import XhsCreator, XhsNote, XhsNoteComment
 
+try:
+    # python-calamine 基于 Rust 解析 xlsx，比 pandas 默认的 openpyxl 快得多；
+    # 未安装时回退到 pandas 默认引擎
+    import python_calamine  # noqa: F401
+
+    EXCEL_ENGINE: str | None = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
 
 NOTE_ALIASES: dict[str, list[str]] = {
     "note_id": ["note_id", "笔记id", "笔记ID"],
@@ -79,6 +90,12 @@ CREATOR_ALIASES: dict[str, list[str]] = {
     "tag_list": ["tag_list", "账号标签"],
 }
 
+# 每批转换并写入数据库的行数：记录字典只按批次驻留内存，避免大表一次性占用过多内存
+DEFAULT_CHUNK_SIZE = 5000
+
+# 单 Sheet 格式里额外的标签列，导入笔记时会与「笔记内容标签」合并写入 tag_list
+NOTE_EXTRA_TAG_COLUMNS: list[str] = ["笔记分类", "提及品类", "种草品牌", "商业合作品牌"]
+
 COMMENT_ALIASES: dict[str, list[str]] = {
     "comment_id": ["comment_id", "评论id", "评论ID"],
     "note_id": ["note_id", "笔记id", "笔记ID"],
@@ -95,84 +112,243 @@ COMMENT_ALIASES: dict[str, list[str]] = {
 }
 
 
-def _build_col_map(df: pd.DataFrame, aliases: dict[str, list[str]]) -> dict[str, str]:
-    """根据别名字典，从 DataFrame 列名中构建字段到真实列名的映射。"""
+def _invert(aliases: dict[str, list[str]]) -> dict[str, tuple[str, int]]:
+    """把「字段 -> 别名列表」倒排成「小写别名 -> (字段, 别名优先级)」。"""
 
-    lower_cols = {c.lower(): c for c in df.columns}
-    col_map: dict[str, str] = {}
+    index: dict[str, tuple[str, int]] = {}
     for field, names in aliases.items():
-        for name in names:
-            col = lower_cols.get(name.lower())
-            if col:
-                col_map[field] = col
-                break
+        for rank, name in enumerate(names):
+            index.setdefault(name.lower(), (field, rank))
+    return index
+
+
+# 别名倒排索引在模块加载时构建一次，匹配列名时只需遍历一遍 DataFrame 的列
+_NOTE_ALIAS_INDEX = _invert(NOTE_ALIASES)
+_CREATOR_ALIAS_INDEX = _invert(CREATOR_ALIASES)
+_COMMENT_ALIAS_INDEX = _invert(COMMENT_ALIASES)
+
+
+def _build_col_map(df: pd.DataFrame, index: dict[str, tuple[str, int]]) -> dict[str, str]:
+    """根据别名倒排索引，从 DataFrame 列名中构建字段到真实列名的映射。
+
+    同一字段命中多个别名时取别名列表中靠前的那个；仅大小写不同的重复列取最后一列。
+    """
+
+    col_map: dict[str, str] = {}
+    best_rank: dict[str, int] = {}
+    for col in df.columns:
+        hit = index.get(col.lower())
+        if hit is None:
+            continue
+        field, rank = hit
+        if rank <= best_rank.get(field, rank):
+            best_rank[field] = rank
+            col_map[field] = col
     return col_map
 
 
-def _get(row: pd.Series, col_map: dict[str, str], field: str, default=None):
-    """安全地从一行中取值，带 NaN 处理。"""
+def _select_fields(
+    df: pd.DataFrame, col_map: dict[str, str], fields: Iterable[str]
+) -> pd.DataFrame:
+    """按字段名整列取值（缺失的列补 None），并把 NaN 统一成 None。"""
 
-    col = col_map.get(field)
-    if not col:
-        return default
-    val = row.get(col, default)
-    try:
-        if pd.isna(val):
-            return default
-    except Exception:
-        pass
-    return val
+    out = pd.DataFrame(index=df.index)
+    for field in fields:
+        col = col_map.get(field)
+        out[field] = df[col] if col else None
+    out = out.astype(object)
+    return out.where(out.notna(), None)
 
 
-def _to_int(val, default=None):
-    """尽量把各种类型（int/float/str）转成 int。"""
+def _present(s: pd.Series) -> pd.Series:
+    """逐行判断值是否非空（None / NaN / 空串都视为空）。"""
+
+    return s.notna() & s.astype(str).ne("")
+
+
+def _to_int_series(s: pd.Series, default: int = 0) -> pd.Series:
+    """把一整列（int/float/str 混合）转成 int64，无法解析的填默认值。"""
+
+    num = pd.to_numeric(s, errors="coerce")
+    num = num.where(num.abs() != float("inf"))
+    return num.fillna(default).astype("int64")
+
+
+def _to_ts_ms_series(s: pd.Series, default: int) -> pd.Series:
+    """把一整列时间字段转换成毫秒时间戳。
+
+    数值（含数字字符串）视为已经是时间戳（秒或毫秒）原样保留；其余按日期时间解析，
+    不带时区的按 UTC 处理；都无法解析的填默认值。
+    """
+
+    num = pd.to_numeric(s, errors="coerce")
+    num = num.where(num.abs() != float("inf"))
+    pending = s[num.isna() & s.notna()]
+    if not pending.empty:
+        dt = pd.to_datetime(pending, errors="coerce", utc=True, format="mixed")
+        epoch_ms = (dt - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)
+        num = num.fillna(epoch_ms)
+    return num.fillna(default).astype("int64")
+
+
+def _clean_str_series(s: pd.Series) -> pd.Series:
+    """只保留字符串值并去掉首尾空白，其余（NaN / 数字等）一律视为空串。"""
 
     try:
-        if pd.isna(val):
-            return default
-    except Exception:
-        pass
-    if isinstance(val, (int, float)):
-        return int(val)
-    if isinstance(val, str) and val.strip():
-        try:
-            return int(float(val))
-        except ValueError:
-            return default
-    return default
-
-
-def _to_ts_ms(val, default=None):
-    """把 Excel 里时间字段转换成毫秒时间戳。"""
-
-    num = _to_int(val, None)
-    if num is not None:
-        # 已经是时间戳（秒或毫秒）
-        return num
-    if val is None:
-        return default
-    try:
-        dt = pd.to_datetime(val)
-        return int(dt.timestamp() * 1000)
-    except Exception:
-        return default
+        return s.str.strip().fillna("")
+    except AttributeError:
+        # 整列都不是字符串（例如全空列被读成 float64）
+        return pd.Series("", index=s.index)
+
+
+def _join_non_empty(parts: list[pd.Series], sep: str = " | ") -> pd.Series:
+    """逐列拼接字符串，跳过空串，不会产生多余的分隔符；全空的行返回 None。"""
 
+    merged = parts[0]
+    for part in parts[1:]:
+        joiner = pd.Series(sep, index=merged.index).where(merged.ne("") & part.ne(""), "")
+        merged = merged + joiner + part
+    # 先转 object：str dtype（pandas 3 默认）下 where(..., None) 会得到 NaN 而不是 None
+    return merged.astype(object).where(merged.ne(""), None)
 
-def _read_sheet(path: Path, sheet_name: str) -> pd.DataFrame | None:
-    """读取指定 Sheet，不存在则返回 None 并打日志。"""
 
+def _read_sheet(excel_file: pd.ExcelFile, sheet_name: str) -> pd.DataFrame | None:
+    """从已打开的工作簿读取指定 Sheet（复用同一次解析），不存在则返回 None 并打日志。"""
+
+    if sheet_name not in excel_file.sheet_names:
+        logger.warning(f"Sheet '{sheet_name}' not found, skip importing.")
+        return None
     try:
-        return pd.read_excel(path, sheet_name=sheet_name)
+        return pd.read_excel(excel_file, sheet_name=sheet_name)
     except ValueError:
         logger.warning(f"Sheet '{sheet_name}' not found, skip importing.")
         return None
 
 
+def _creator_records(df: pd.DataFrame, col_map: dict[str, str], now_ms: int) -> list[dict]:
+    """把一批创作者行转换成 xhs_creator 的字典记录（调用方负责去重与空 user_id 过滤）。"""
+
+    frame = _select_fields(df, col_map, CREATOR_ALIASES)
+    frame["user_id"] = frame["user_id"].astype(str)
+    for field in ("follows", "fans", "interaction"):
+        frame[field] = _to_int_series(frame[field]).astype(str)
+    frame["add_ts"] = now_ms
+    frame["last_modify_ts"] = now_ms
+    return frame.to_dict(orient="records")
+
+
+def _note_records(df: pd.DataFrame, col_map: dict[str, str], now_ms: int) -> list[dict]:
+    """把一批笔记行转换成 xhs_note 的字典记录。"""
+
+    frame = _select_fields(df, col_map, NOTE_ALIASES)
+    if "note_id" in col_map:
+        # 显式提供了 note_id 列，但某些行为空，则跳过这些行
+        frame = frame[_present(frame["note_id"])]
+        frame["note_id"] = frame["note_id"].astype(str)
+    else:
+        # 没有 note_id 列时，使用行号生成一个稳定但无业务含义的 ID
+        frame["note_id"] = "row_" + pd.Series(frame.index + 1, index=frame.index).astype(str)
+    if frame.empty:
+        return []
+
+    frame["time"] = _to_ts_ms_series(frame["time"], now_ms)
+
+    # 处理标签：优先使用笔记内容标签，如果有“笔记分类 / 提及品类 / 种草品牌 / 商业合作品牌”
+    # 会一并拼接进去，便于后续分析。
+    extra_tag_cols = [c for c in NOTE_EXTRA_TAG_COLUMNS if c in df.columns]
+    tag_parts = [frame["tag_list"].fillna("").astype(str).str.strip()]
+    tag_parts += [_clean_str_series(df.loc[frame.index, c]) for c in extra_tag_cols]
+    frame["tag_list"] = _join_non_empty(tag_parts)
+
+    # 如果 user_id 为空，使用占位符 "unknown" 避免 NOT NULL 约束报错
+    frame["user_id"] = frame["user_id"].where(_present(frame["user_id"]), "unknown").astype(str)
+    # Core INSERT 会原样写入显式传入的 None，不会套用模型上 source_keyword 的默认值 ''
+    frame["source_keyword"] = frame["source_keyword"].where(frame["source_keyword"].notna(), "")
+
+    for field in ("liked_count", "collected_count", "comment_count", "share_count"):
+        frame[field] = _to_int_series(frame[field]).astype(str)
+
+    frame["add_ts"] = now_ms
+    frame["last_modify_ts"] = now_ms
+    frame["last_update_time"] = now_ms
+    frame["type"] = None
+    frame["video_url"] = None
+    frame["image_list"] = None
+    frame["xsec_token"] = None
+    return frame.to_dict(orient="records")
+
+
+def _comment_records(df: pd.DataFrame, col_map: dict[str, str], now_ms: int) -> list[dict]:
+    """把一批评论行转换成 xhs_note_comment 的字典记录。"""
+
+    frame = _select_fields(df, col_map, COMMENT_ALIASES)
+    frame = frame[_present(frame["comment_id"]) & _present(frame["note_id"])]
+    if frame.empty:
+        return []
+    frame["comment_id"] = frame["comment_id"].astype(str)
+    frame["note_id"] = frame["note_id"].astype(str)
+    # 转成 str 后显式回到 object 再置空：str dtype（pandas 3 默认）下 where(..., None) 会得到 NaN
+    frame["user_id"] = (
+        frame["user_id"].astype(str).astype(object).where(_present(frame["user_id"]), None)
+    )
+    frame["create_time"] = _to_ts_ms_series(frame["create_time"], now_ms)
+    frame["sub_comment_count"] = _to_int_series(frame["sub_comment_count"])
+    frame["like_count"] = _to_int_series(frame["like_count"]).astype(str)
+    frame["add_ts"] = now_ms
+    frame["last_modify_ts"] = now_ms
+    return frame.to_dict(orient="records")
+
+
+async def _bulk_insert(session, model, records: list[dict]) -> None:
+    """用 Core INSERT 的 executemany 形式批量写入字典记录，不经过 ORM 映射层。"""
+
+    if records:
+        await session.execute(insert(model.__table__), records)
+
+
+async def _insert_in_chunks(
+    session,
+    model,
+    df: pd.DataFrame,
+    build_records: Callable[[pd.DataFrame], list[dict]],
+    chunk_size: int,
+) -> int:
+    """按 chunk_size 行分批转换并写入，同一时刻只在内存中保留一批字典记录。"""
+
+    total = 0
+    for start in range(0, len(df), chunk_size):
+        records = build_records(df.iloc[start:start + chunk_size])
+        await _bulk_insert(session, model, records)
+        total += len(records)
+    return total
+
+
+async def _import_sheet(
+    session,
+    model,
+    df: pd.DataFrame,
+    build_records: Callable[[pd.DataFrame], list[dict]],
+    chunk_size: int,
+    label: str,
+) -> None:
+    """在独立的 SAVEPOINT 中导入一个 Sheet：失败时只回滚这一个 Sheet 的写入，其它 Sheet 照常提交。"""
+
+    table = model.__tablename__
+    try:
+        async with session.begin_nested():
+            inserted = await _insert_in_chunks(session, model, df, build_records, chunk_size)
+    except Exception as e:
+        logger.error(f"导入 {table} 失败，已回滚到该 Sheet 的 SAVEPOINT，跳过: {e}")
+        return
+    logger.info(f"Inserted {inserted} {label} into {table}.")
+
+
 async def import_from_excel(
     path: Path,
     notes_sheet: str = "xhs_note",
     creators_sheet: str = "xhs_creator",
     comments_sheet: str = "xhs_note_comment",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
 ) -> None:
     """导入 Excel 数据到 xhs_creator / xhs_note / xhs_note_comment。"""
 
@@ -181,173 +357,77 @@ async def import_from_excel(
         raise FileNotFoundError(path)
 
     now_ms = int(time.time() * 1000)
+    chunk_size = max(1, chunk_size)
 
     # 兼容两种情况：
     # 1) Excel 只有一个 Sheet：用这一个 Sheet 同时导入 note + creator；
     # 2) Excel 有多个 Sheet：按老逻辑分别按名字读取。
-    try:
-        excel_file = pd.ExcelFile(path)
+    # 两种情况都只打开/解析一次工作簿，各个 Sheet 从同一个 ExcelFile 中读取。
+    with pd.ExcelFile(path, engine=EXCEL_ENGINE) as excel_file:
         sheet_names = excel_file.sheet_names
-    except Exception:
-        excel_file = None
-        sheet_names = []
-
-    if len(sheet_names) == 1 and excel_file is not None:
-        df_single = pd.read_excel(excel_file, sheet_name=sheet_names[0])
-        logger.info(
-            f"Excel 仅包含一个 Sheet ('{sheet_names[0]}')，"
-            "将使用该 Sheet 同时导入 xhs_note 和 xhs_creator。"
-        )
-        df_notes = df_single
-        df_creators = df_single
-        df_comments = None
-    else:
-        df_notes = _read_sheet(path, notes_sheet)
-        df_creators = _read_sheet(path, creators_sheet)
-        df_comments = _read_sheet(path, comments_sheet)
+        if len(sheet_names) == 1:
+            df_single = pd.read_excel(excel_file, sheet_name=sheet_names[0])
+            logger.info(
+                f"Excel 仅包含一个 Sheet ('{sheet_names[0]}')，"
+                "将使用该 Sheet 同时导入 xhs_note 和 xhs_creator。"
+            )
+            df_notes = df_single
+            df_creators = df_single
+            df_comments = None
+        else:
+            df_notes = _read_sheet(excel_file, notes_sheet)
+            df_creators = _read_sheet(excel_file, creators_sheet)
+            df_comments = _read_sheet(excel_file, comments_sheet)
 
     async with get_session() as session:
         if session is None:
             logger.error("数据库未配置为 SQL 类型（当前 SAVE_DATA_OPTION 不是 mysql/sqlite/postgresql），无法导入。")
             return
 
-        # ---------- xhs_creator ----------
-        if df_creators is not None and not df_creators.empty:
-            col_map = _build_col_map(df_creators, CREATOR_ALIASES)
-            if "user_id" not in col_map:
-                logger.warning("Creator sheet 缺少 user_id 列，跳过导入 xhs_creator。")
-            else:
-                objs: list[XhsCreator] = []
-                seen_user_ids: set[str] = set()
-                for _, row in df_creators.iterrows():
-                    user_id = _get(row, col_map, "user_id")
-                    if not user_id:
-                        continue
-                    user_id_str = str(user_id)
-                    # 去重：同一个账号只插入一条 creator 记录
-                    if user_id_str in seen_user_ids:
-                        continue
-                    seen_user_ids.add(user_id_str)
-                    obj = XhsCreator(
-                        user_id=user_id_str,
-                        nickname=_get(row, col_map, "nickname"),
-                        avatar=_get(row, col_map, "avatar"),
-                        ip_location=_get(row, col_map, "ip_location"),
-                        desc=_get(row, col_map, "desc"),
-                        gender=_get(row, col_map, "gender"),
-                        follows=str(_to_int(_get(row, col_map, "follows"), 0)),
-                        fans=str(_to_int(_get(row, col_map, "fans"), 0)),
-                        interaction=str(_to_int(_get(row, col_map, "interaction"), 0)),
-                        tag_list=_get(row, col_map, "tag_list"),
-                        add_ts=now_ms,
-                        last_modify_ts=now_ms,
+        # 整个导入放在一个显式事务里、只提交一次；每个 Sheet 各自使用一个 SAVEPOINT
+        async with session.begin():
+            # ---------- xhs_creator ----------
+            if df_creators is not None and not df_creators.empty:
+                col_map = _build_col_map(df_creators, _CREATOR_ALIAS_INDEX)
+                if "user_id" not in col_map:
+                    logger.warning("Creator sheet 缺少 user_id 列，跳过导入 xhs_creator。")
+                else:
+                    uid_col = col_map["user_id"]
+                    df_creators = df_creators[_present(df_creators[uid_col])]
+                    # 去重：同一个账号只插入一条 creator 记录（在分批之前整表去重，跨批次也不会重复）；
+                    # 先统一成字符串，保证 1001 与 "1001" 视为同一账号
+                    df_creators = df_creators.assign(
+                        **{uid_col: df_creators[uid_col].astype(str)}
+                    ).drop_duplicates(subset=[uid_col], keep="first")
+                    await _import_sheet(
+                        session, XhsCreator, df_creators,
+                        lambda chunk: _creator_records(chunk, col_map, now_ms), chunk_size, "creators",
+                    )
+
+            # ---------- xhs_note ----------
+            if df_notes is not None and not df_notes.empty:
+                col_map = _build_col_map(df_notes, _NOTE_ALIAS_INDEX)
+                if "note_id" not in col_map:
+                    logger.warning(
+                        "Note sheet 缺少 note_id 列，将使用自动生成的 note_id（row_行号）。"
                     )
-                    objs.append(obj)
-                if objs:
-                    session.add_all(objs)
-                logger.info(f"Inserted {len(objs)} creators into xhs_creator.")
-
-        # ---------- xhs_note ----------
-        if df_notes is not None and not df_notes.empty:
-            col_map = _build_col_map(df_notes, NOTE_ALIASES)
-            objs: list[XhsNote] = []
-            if "note_id" not in col_map:
-                logger.warning(
-                    "Note sheet 缺少 note_id 列，将使用自动生成的 note_id（row_行号）。"
+                await _import_sheet(
+                    session, XhsNote, df_notes,
+                    lambda chunk: _note_records(chunk, col_map, now_ms), chunk_size, "notes",
                 )
-            for idx, row in df_notes.iterrows():
-                if "note_id" in col_map:
-                    note_id = _get(row, col_map, "note_id")
-                    if not note_id:
-                        # 显式提供了 note_id 列，但这一行为空，则跳过
-                        continue
+
+            # ---------- xhs_note_comment ----------
+            if df_comments is not None and not df_comments.empty:
+                col_map = _build_col_map(df_comments, _COMMENT_ALIAS_INDEX)
+                if "comment_id" not in col_map or "note_id" not in col_map:
+                    logger.warning(
+                        "Comment sheet 需要至少包含 comment_id 与 note_id 列，跳过导入 xhs_note_comment。"
+                    )
                 else:
-                    # 没有 note_id 列时，使用行号生成一个稳定但无业务含义的 ID
-                    note_id = f"row_{idx + 1}"
-
-                t_ms = _to_ts_ms(_get(row, col_map, "time"), now_ms)
-
-                # 处理标签：优先使用笔记内容标签，如果有“笔记分类 / 提及品类 / 种草品牌 / 商业合作品牌”
-                # 会一并拼接进去，便于后续分析。
-                raw_tag_list = _get(row, col_map, "tag_list")
-                extra_tags: list[str] = []
-                for col_name in ["笔记分类", "提及品类", "种草品牌", "商业合作品牌"]:
-                    if col_name in df_notes.columns:
-                        val = row.get(col_name)
-                        if isinstance(val, str) and val.strip():
-                            extra_tags.append(val.strip())
-                if raw_tag_list is not None and str(raw_tag_list).strip():
-                    extra_tags.insert(0, str(raw_tag_list).strip())
-                merged_tag_list = " | ".join(extra_tags) if extra_tags else None
-
-                # 如果 user_id 为空，使用占位符 "unknown" 避免 NOT NULL 约束报错
-                raw_user_id = _get(row, col_map, "user_id")
-                user_id_str = str(raw_user_id) if raw_user_id else "unknown"
-
-                obj = XhsNote(
-                    user_id=user_id_str,
-                    nickname=_get(row, col_map, "nickname"),
-                    avatar=_get(row, col_map, "avatar"),
-                    ip_location=_get(row, col_map, "ip_location"),
-                    add_ts=now_ms,
-                    last_modify_ts=now_ms,
-                    note_id=str(note_id),
-                    type=None,
-                    title=_get(row, col_map, "title"),
-                    desc=_get(row, col_map, "desc"),
-                    video_url=None,
-                    time=t_ms,
-                    last_update_time=now_ms,
-                    liked_count=str(_to_int(_get(row, col_map, "liked_count"), 0)),
-                    collected_count=str(_to_int(_get(row, col_map, "collected_count"), 0)),
-                    comment_count=str(_to_int(_get(row, col_map, "comment_count"), 0)),
-                    share_count=str(_to_int(_get(row, col_map, "share_count"), 0)),
-                    image_list=None,
-                    tag_list=merged_tag_list,
-                    note_url=_get(row, col_map, "note_url"),
-                    source_keyword=_get(row, col_map, "source_keyword"),
-                    xsec_token=None,
-                )
-                objs.append(obj)
-            if objs:
-                session.add_all(objs)
-            logger.info(f"Inserted {len(objs)} notes into xhs_note.")
-
-        # ---------- xhs_note_comment ----------
-        if df_comments is not None and not df_comments.empty:
-            col_map = _build_col_map(df_comments, COMMENT_ALIASES)
-            if "comment_id" not in col_map or "note_id" not in col_map:
-                logger.warning(
-                    "Comment sheet 需要至少包含 comment_id 与 note_id 列，跳过导入 xhs_note_comment。"
-                )
-            else:
-                objs = []
-                for _, row in df_comments.iterrows():
-                    comment_id = _get(row, col_map, "comment_id")
-                    note_id = _get(row, col_map, "note_id")
-                    if not comment_id or not note_id:
-                        continue
-                    ct_ms = _to_ts_ms(_get(row, col_map, "create_time"), now_ms)
-                    obj = XhsNoteComment(
-                        user_id=str(_get(row, col_map, "user_id")) if _get(row, col_map, "user_id") else None,
-                        nickname=_get(row, col_map, "nickname"),
-                        avatar=_get(row, col_map, "avatar"),
-                        ip_location=_get(row, col_map, "ip_location"),
-                        add_ts=now_ms,
-                        last_modify_ts=now_ms,
-                        comment_id=str(comment_id),
-                        create_time=ct_ms,
-                        note_id=str(note_id),
-                        content=_get(row, col_map, "content"),
-                        sub_comment_count=_to_int(_get(row, col_map, "sub_comment_count"), 0) or 0,
-                        pictures=_get(row, col_map, "pictures"),
-                        parent_comment_id=_get(row, col_map, "parent_comment_id"),
-                        like_count=str(_to_int(_get(row, col_map, "like_count"), 0)),
+                    await _import_sheet(
+                        session, XhsNoteComment, df_comments,
+                        lambda chunk: _comment_records(chunk, col_map, now_ms), chunk_size, "comments",
                     )
-                    objs.append(obj)
-                if objs:
-                    session.add_all(objs)
-                logger.info(f"Inserted {len(objs)} comments into xhs_note_comment.")
 
 
 async def _main_async(args: argparse.Namespace) -> None:
@@ -358,6 +438,7 @@ async def _main_async(args: argparse.Namespace) -> None:
         notes_sheet=args.notes_sheet,
         creators_sheet=args.creators_sheet,
         comments_sheet=args.comments_sheet,
+        chunk_size=args.chunk_size,
     )
 
 
@@ -375,6 +456,12 @@ def main() -> None:
         default="xhs_note_comment",
         help="评论 Sheet 名称，默认 xhs_note_comment",
     )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"每批转换并写入的行数，默认 {DEFAULT_CHUNK_SIZE}",
+    )
     args = parser.parse_args()
 
     asyncio.run(_main_async(args))
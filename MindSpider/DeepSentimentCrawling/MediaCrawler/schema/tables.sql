@@ -588,3 +588,6 @@ alter table douyin_aweme_comment add column `like_count` varchar(255) NOT NULL D
 alter table xhs_note add column xsec_token varchar(50) default null comment '签名算法';
 alter table douyin_aweme_comment add column `pictures` varchar(500) NOT NULL DEFAULT '' COMMENT '评论图片列表';
 alter table bilibili_video_comment add column `like_count` varchar(255) NOT NULL DEFAULT '0' COMMENT '点赞数';
+
+-- 按来源关键词筛选小红书笔记（WHERE source_keyword = / LIKE '关键词%'）时走索引
+create index idx_xhs_note_source_keyword on xhs_note (source_keyword);
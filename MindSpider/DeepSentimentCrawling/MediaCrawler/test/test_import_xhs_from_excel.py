@@ -0,0 +1,57 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：  
+# 1. 不得用于任何商业用途。  
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。  
+# 3. 不得进行大规模爬取或对平台造成运营干扰。  
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。   
+# 5. 不得用于任何非法或不当的用途。
+#   
+# 详细许可条款请参阅项目根目录下的LICENSE文件。  
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。  
+
+
+# -*- coding: utf-8 -*-
+
+import math
+
+import pandas as pd
+
+import import_xhs_from_excel as importer
+
+
+def _assert_no_nan(records):
+    for record in records:
+        for field, value in record.items():
+            assert not (isinstance(value, float) and math.isnan(value)), f"{field} is NaN"
+
+
+def test_note_records_empty_fields_are_none():
+    df = pd.DataFrame({
+        "笔记内容标签": [None, "美妆"],
+        "笔记分类": [1.0, None],
+        "账号小红书号": ["u1", None],
+        "笔记标题": [None, "标题"],
+    })
+    col_map = importer._build_col_map(df, importer._NOTE_ALIAS_INDEX)
+    records = importer._note_records(df, col_map, now_ms=1)
+
+    _assert_no_nan(records)
+    assert records[0]["tag_list"] is None
+    assert records[0]["title"] is None
+    assert records[1]["tag_list"] == "美妆"
+    assert records[1]["user_id"] == "unknown"
+
+
+def test_comment_records_empty_fields_are_none():
+    df = pd.DataFrame({
+        "评论id": ["c1", "c2"],
+        "笔记id": ["n1", "n1"],
+        "账号小红书号": [None, "u2"],
+        "评论内容": [None, "不错"],
+    })
+    col_map = importer._build_col_map(df, importer._COMMENT_ALIAS_INDEX)
+    records = importer._comment_records(df, col_map, now_ms=1)
+
+    _assert_no_nan(records)
+    assert records[0]["user_id"] is None
+    assert records[0]["content"] is None
+    assert records[1]["user_id"] == "u2"
@@ -0,0 +1,12 @@
+-- ===============================
+-- 为已有数据库补建 xhs_note.source_keyword 索引
+-- ===============================
+
+-- create_all 不会给已存在的表补建索引，已有数据库需手动执行对应方言的一条语句。
+-- 新建的数据库（init_database.py / models_bigdata.py）已包含该索引，无需执行。
+
+-- MySQL：TEXT 列需要指定前缀长度
+CREATE INDEX `idx_xhs_note_source_keyword` ON `xhs_note` (`source_keyword`(255));
+
+-- PostgreSQL：非 C 排序规则下需 text_pattern_ops 才能支持 LIKE '关键词%'
+-- CREATE INDEX IF NOT EXISTS idx_xhs_note_source_keyword ON xhs_note (source_keyword text_pattern_ops);
@@ -10,7 +10,7 @@
 """
 
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, String, BigInteger, Text, ForeignKey
+from sqlalchemy import Integer, String, BigInteger, Text, ForeignKey, Index
 
 # 使用 models_sa 中的 Base，确保所有表在同一个 metadata 中，外键引用可以正常工作
 from models_sa import Base
@@ -320,6 +320,15 @@ class XhsNote(Base):
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("crawling_tasks.task_id", ondelete="SET NULL"), nullable=True)
 
+    # 按来源关键词前缀筛选（LIKE '关键词%'）时走索引；已有数据库请执行 add_xhs_note_source_keyword_index.sql
+    __table_args__ = (
+        Index(
+            "idx_xhs_note_source_keyword", "source_keyword",
+            mysql_length=255,
+            postgresql_ops={"source_keyword": "text_pattern_ops"},
+        ),
+    )
+
 
 class XhsNoteComment(Base):
     __tablename__ = "xhs_note_comment"
@@ -37,6 +37,8 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = Field("your_db_password", description="数据库密码")
     DB_NAME: str = Field("your_db_name", description="数据库名称")
     DB_CHARSET: str = Field("utf8mb4", description="数据库字符集，推荐utf8mb4，兼容emoji")
+    DB_POOL_SIZE: int = Field(5, description="数据库连接池常驻连接数")
+    DB_MAX_OVERFLOW: int = Field(15, description="连接池满时允许额外创建的连接数（最大连接数 = DB_POOL_SIZE + DB_MAX_OVERFLOW）")
     
     # ======================= LLM 相关 =======================
     # 我们的LLM模型API赞助商有：https://share.302.ai/P66Qe3、https://aihubmix.com/?aff=8Ds9，提供了非常全面的模型api
@@ -75,6 +77,8 @@ class Settings(BaseSettings):
     KEYWORD_OPTIMIZER_API_KEY: Optional[str] = Field(None, description="SQL Keyword Optimizer（推荐 qwen-plus，官方申请地址：https://www.aliyun.com/product/bailian）API 密钥")
     KEYWORD_OPTIMIZER_BASE_URL: Optional[str] = Field(None, description="Keyword Optimizer BaseUrl，可按所选服务配置")
     KEYWORD_OPTIMIZER_MODEL_NAME: Optional[str] = Field(None, description="Keyword Optimizer LLM 模型名称，例如 qwen-plus")
+    KEYWORD_OPTIMIZER_CACHE_TTL: int = Field(3600, description="关键词优化结果缓存有效期（秒），0 表示关闭缓存")
+    KEYWORD_OPTIMIZER_SEMANTIC_CACHE_MODEL: Optional[str] = Field(None, description="语义缓存使用的 sentence-transformers 模型，例如 paraphrase-multilingual-MiniLM-L12-v2；留空则只启用精确缓存")
     
     # ================== 网络工具配置 ====================
     # Tavily API（申请地址：https://www.tavily.com/）
@@ -9,15 +9,52 @@
 """
 
 import argparse
+import functools
 import sys
 import os
-from pathlib import Path
+import threading
 from datetime import datetime
+from typing import Optional
 from loguru import logger
 
-# 添加项目路径
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+# 日志分隔横幅，模块加载时构建一次
+SEP = "=" * 60
+SEP_TOP = f"\n{SEP}"
+SEP_BOTTOM = f"{SEP}\n"
+
+
+# 各引擎由 _import_engines() 在解析完命令行参数后导入一次（--help 等无需加载这些重量级依赖）；
+# 导入失败时先记下异常，由 check_environment 统一报告
+create_agent = None
+State = None
+create_report_agent = None
+ReportState = None
+_INSIGHT_IMPORT_ERROR: Optional[ImportError] = None
+_REPORT_IMPORT_ERROR: Optional[ImportError] = None
+_DB_IMPORT_ERROR: Optional[ImportError] = None
+
+
+def _import_engines():
+    """导入 InsightEngine / ReportEngine / 数据库模块，并记录各自的导入异常"""
+    global create_agent, State, create_report_agent, ReportState
+    global _INSIGHT_IMPORT_ERROR, _REPORT_IMPORT_ERROR, _DB_IMPORT_ERROR
+
+    try:
+        from InsightEngine import create_agent
+        from InsightEngine.state import State
+    except ImportError as e:
+        _INSIGHT_IMPORT_ERROR = e
+
+    try:
+        from ReportEngine import create_agent as create_report_agent
+        from ReportEngine.state import ReportState
+    except ImportError as e:
+        _REPORT_IMPORT_ERROR = e
+
+    try:
+        from MindSpider.DeepSentimentCrawling.MediaCrawler.database.db_session import get_session  # noqa: F401
+    except ImportError as e:
+        _DB_IMPORT_ERROR = e
 
 
 def check_environment():
@@ -25,32 +62,52 @@ def check_environment():
     logger.info("检查环境配置...")
     
     # 检查 InsightEngine
-    try:
-        from InsightEngine import DeepSearchAgent, create_agent
-        logger.success("✓ InsightEngine 可用")
-    except ImportError as e:
-        logger.error(f"✗ InsightEngine 导入失败: {e}")
+    if _INSIGHT_IMPORT_ERROR is not None:
+        logger.error(f"✗ InsightEngine 导入失败: {_INSIGHT_IMPORT_ERROR}")
         return False
+    logger.success("✓ InsightEngine 可用")
     
     # 检查 ReportEngine
-    try:
-        from ReportEngine import ReportAgent, create_agent as create_report_agent
-        logger.success("✓ ReportEngine 可用")
-    except ImportError as e:
-        logger.error(f"✗ ReportEngine 导入失败: {e}")
+    if _REPORT_IMPORT_ERROR is not None:
+        logger.error(f"✗ ReportEngine 导入失败: {_REPORT_IMPORT_ERROR}")
         return False
+    logger.success("✓ ReportEngine 可用")
     
     # 检查数据库配置
-    try:
-        from MindSpider.DeepSentimentCrawling.MediaCrawler.database.db_session import get_session
-        logger.success("✓ 数据库配置可用")
-    except ImportError as e:
-        logger.error(f"✗ 数据库配置导入失败: {e}")
+    if _DB_IMPORT_ERROR is not None:
+        logger.error(f"✗ 数据库配置导入失败: {_DB_IMPORT_ERROR}")
         return False
+    logger.success("✓ 数据库配置可用")
     
     return True
 
 
+@functools.lru_cache(maxsize=1)
+def _get_insight_agent():
+    """获取 InsightEngine agent（只创建一次，多次运行复用同一套 LLM 客户端与数据库连接）"""
+    return create_agent()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_report_agent():
+    """获取 ReportEngine agent（只创建一次，多次运行复用同一套 LLM 客户端与渲染组件）"""
+    return create_report_agent()
+
+
+def _warm_up_report_agent() -> threading.Thread:
+    """在后台线程中提前构建 ReportEngine agent，与 InsightEngine 分析并行，缩短步骤 2 的启动时间"""
+    def _warm_up():
+        try:
+            _get_report_agent()
+        except Exception as e:
+            # 预热失败不影响主流程，步骤 2 会重新创建 agent 并报告错误
+            logger.warning(f"ReportEngine 预热失败: {e}")
+
+    thread = threading.Thread(target=_warm_up, name="report-agent-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
 def run_insight_analysis(keyword: str, limit: int = 50) -> str:
     """
     运行 InsightEngine 分析
@@ -62,15 +119,14 @@ def run_insight_analysis(keyword: str, limit: int = 50) -> str:
     Returns:
         生成的 Markdown 报告路径
     """
-    logger.info(f"\n{'='*60}")
+    logger.info(SEP_TOP)
     logger.info(f"步骤 1: 运行 InsightEngine 分析")
     logger.info(f"关键词: {keyword}")
-    logger.info(f"{'='*60}\n")
+    logger.info(SEP_BOTTOM)
     
-    from InsightEngine import create_agent
-    
-    # 创建 agent
-    agent = create_agent()
+    # 获取 agent；复用的实例会保留上一次运行的段落，每次分析前重置状态
+    agent = _get_insight_agent()
+    agent.state = State()
     
     # 构造查询语句（聚焦品牌内容/选题/爆款分析）
     query = (
@@ -79,16 +135,17 @@ def run_insight_analysis(keyword: str, limit: int = 50) -> str:
         f"以及后续内容投放和选题策略建议。"
     )
     
+    # 按热度在数据库端预取前 limit 条笔记，替代第一个段落的初始搜索
+    top_notes = agent.search_agency.get_top_xhs_notes(keyword, limit=limit)
+    logger.info(f"已预取 {top_notes.results_count} 条高热度笔记")
+    
     # 执行分析（会自动从数据库读取数据）
     logger.info(f"开始分析，这可能需要几分钟...")
-    report_content = agent.research(query=query, save_report=True)
+    result = agent.research(query=query, save_report=True, prefetched=top_notes)
     
-    # 找到生成的报告文件
-    output_dir = Path(agent.config.OUTPUT_DIR)
-    report_files = sorted(output_dir.glob("*.md"), key=lambda p: p.stat().st_mtime, reverse=True)
-    
-    if report_files:
-        latest_report = report_files[0]
+    # research 直接返回保存的报告路径，无需再扫描输出目录
+    latest_report = result['path']
+    if latest_report is not None:
         logger.success(f"✓ InsightEngine 报告已生成: {latest_report}")
         return str(latest_report)
     else:
@@ -107,14 +164,13 @@ def run_report_generation(insight_report_path: str, keyword: str) -> dict:
     Returns:
         包含 html_content 和文件路径的字典
     """
-    logger.info(f"\n{'='*60}")
+    logger.info(SEP_TOP)
     logger.info(f"步骤 2: 运行 ReportEngine 生成最终报告")
-    logger.info(f"{'='*60}\n")
-    
-    from ReportEngine import create_agent as create_report_agent
+    logger.info(SEP_BOTTOM)
     
-    # 创建 agent
-    agent = create_report_agent()
+    # 获取 agent；复用的实例会保留上一次运行的报告状态，每次生成前重置
+    agent = _get_report_agent()
+    agent.state = ReportState()
     
     # 读取 InsightEngine 报告
     with open(insight_report_path, 'r', encoding='utf-8') as f:
@@ -170,6 +226,9 @@ def main():
     
     args = parser.parse_args()
     
+    # 参数解析通过后再加载各引擎
+    _import_engines()
+    
     # 检查环境
     if not check_environment():
         logger.error("环境检查失败，请确保已正确安装 InsightEngine 和 ReportEngine")
@@ -184,17 +243,20 @@ def main():
             insight_report_path = args.insight_report
             logger.info(f"跳过 InsightEngine 分析，使用已有报告: {insight_report_path}")
         else:
+            # InsightEngine 分析耗时较长，期间在后台把 ReportEngine agent 构建好
+            report_warmup = _warm_up_report_agent()
             insight_report_path = run_insight_analysis(args.keyword, args.limit)
             if not insight_report_path:
                 logger.error("InsightEngine 分析失败")
                 sys.exit(1)
+            report_warmup.join()
         
         # 步骤 2: ReportEngine 生成最终报告
         result = run_report_generation(insight_report_path, args.keyword)
         
-        logger.success(f"\n{'='*60}")
+        logger.success(SEP_TOP)
         logger.success("✓ 完整报告生成流程完成！")
-        logger.success(f"{'='*60}\n")
+        logger.success(SEP_BOTTOM)
         
     except KeyboardInterrupt:
         logger.warning("\n用户中断")
@@ -19,12 +19,35 @@
 import argparse
 import sys
 import asyncio
-from pathlib import Path
 from loguru import logger
 
-# 添加项目路径
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+# 日志分隔横幅，模块加载时构建一次
+SEP = "=" * 60
+SEP_TOP = f"\n{SEP}"
+SEP_BOTTOM = f"{SEP}\n"
+
+# 查询语句在模块加载时压缩成单行规范形式：发往数据库的字节更少，同一语句的文本也始终一致
+# 笔记数、创作者数和互动统计在同一条 SQL 中一次扫描算出
+_Q_STATS = " ".join("""
+    SELECT
+        COUNT(*) as total_notes,
+        COUNT(DISTINCT user_id) as total_creators,
+        SUM(CAST(liked_count AS UNSIGNED)) as total_likes,
+        SUM(CAST(collected_count AS UNSIGNED)) as total_collects,
+        SUM(CAST(comment_count AS UNSIGNED)) as total_comments,
+        SUM(CAST(share_count AS UNSIGNED)) as total_shares
+    FROM xhs_note
+    WHERE source_keyword LIKE :keyword
+""".split())
+
+# 最近的几条笔记
+_Q_RECENT = " ".join("""
+    SELECT note_id, title, nickname, liked_count, comment_count
+    FROM xhs_note
+    WHERE source_keyword LIKE :keyword
+    ORDER BY time DESC
+    LIMIT 5
+""".split())
 
 
 async def test_database_connection():
@@ -32,11 +55,10 @@ async def test_database_connection():
     logger.info("测试数据库连接...")
     
     try:
-        from InsightEngine.utils.db import fetch_all
+        from InsightEngine.utils.db import ping
         
-        # 简单查询测试
-        result = await fetch_all("SELECT 1 as test")
-        if result and result[0]['test'] == 1:
+        # 连通性检查：借出池中连接并 ping 一次，不走 SQL 查询
+        if await ping():
             logger.success("✓ 数据库连接成功")
             return True
         else:
@@ -55,14 +77,16 @@ async def query_xhs_data(keyword: str):
     
     from InsightEngine.utils.db import fetch_all
     
-    # 查询笔记数量
-    note_count_query = """
-        SELECT COUNT(*) as count 
-        FROM xhs_note 
-        WHERE source_keyword LIKE :keyword
-    """
-    note_count = await fetch_all(note_count_query, {"keyword": f"%{keyword}%"})
-    total_notes = note_count[0]['count'] if note_count else 0
+    # 前缀匹配（不以 % 开头）才能用上 source_keyword 索引，避免全表扫描
+    params = {"keyword": f"{keyword}%"}
+    
+    # 两条查询互不依赖，并发执行
+    summary, recent_notes = await asyncio.gather(
+        fetch_all(_Q_STATS, params),
+        fetch_all(_Q_RECENT, params),
+    )
+    stats = summary[0] if summary else {}
+    total_notes = stats.get('total_notes') or 0
     
     logger.info(f"  找到 {total_notes} 条笔记")
     
@@ -71,65 +95,42 @@ async def query_xhs_data(keyword: str):
         logger.info("  提示：检查数据库中 xhs_note 表的 source_keyword 字段")
         return None
     
-    # 查询创作者数量
-    creator_count_query = """
-        SELECT COUNT(DISTINCT user_id) as count 
-        FROM xhs_note 
-        WHERE source_keyword LIKE :keyword
-    """
-    creator_count = await fetch_all(creator_count_query, {"keyword": f"%{keyword}%"})
-    total_creators = creator_count[0]['count'] if creator_count else 0
-    
-    logger.info(f"  涉及 {total_creators} 个创作者")
-    
-    # 查询互动数据统计
-    engagement_query = """
-        SELECT 
-            SUM(CAST(liked_count AS UNSIGNED)) as total_likes,
-            SUM(CAST(collected_count AS UNSIGNED)) as total_collects,
-            SUM(CAST(comment_count AS UNSIGNED)) as total_comments,
-            SUM(CAST(share_count AS UNSIGNED)) as total_shares
-        FROM xhs_note 
-        WHERE source_keyword LIKE :keyword
-    """
-    engagement = await fetch_all(engagement_query, {"keyword": f"%{keyword}%"})
-    
-    if engagement:
-        stats = engagement[0]
-        logger.info(f"  互动统计:")
-        logger.info(f"    点赞: {stats.get('total_likes', 0):,}")
-        logger.info(f"    收藏: {stats.get('total_collects', 0):,}")
-        logger.info(f"    评论: {stats.get('total_comments', 0):,}")
-        logger.info(f"    分享: {stats.get('total_shares', 0):,}")
-    
-    # 查询最近的几条笔记
-    recent_notes_query = """
-        SELECT note_id, title, nickname, liked_count, comment_count
-        FROM xhs_note 
-        WHERE source_keyword LIKE :keyword
-        ORDER BY time DESC
-        LIMIT 5
-    """
-    recent_notes = await fetch_all(recent_notes_query, {"keyword": f"%{keyword}%"})
+    total_creators = stats.get('total_creators') or 0
+    engagement = {
+        key: stats.get(key)
+        for key in ('total_likes', 'total_collects', 'total_comments', 'total_shares')
+    }
+    
+    # 统计信息与最近笔记各自拼成一条多行日志输出
+    _message = (
+        f"  涉及 {total_creators} 个创作者\n"
+        f"  互动统计:\n"
+        f"    点赞: {engagement['total_likes'] or 0:,}\n"
+        f"    收藏: {engagement['total_collects'] or 0:,}\n"
+        f"    评论: {engagement['total_comments'] or 0:,}\n"
+        f"    分享: {engagement['total_shares'] or 0:,}"
+    )
+    logger.info(_message)
     
     if recent_notes:
-        logger.info(f"\n  最近的 {len(recent_notes)} 条笔记:")
+        _message = f"\n  最近的 {len(recent_notes)} 条笔记:"
         for i, note in enumerate(recent_notes, 1):
             title = note.get('title', '无标题')[:30]
-            logger.info(f"    {i}. {title}... (作者: {note.get('nickname', '未知')}, 点赞: {note.get('liked_count', 0)})")
+            _message += f"\n    {i}. {title}... (作者: {note.get('nickname', '未知')}, 点赞: {note.get('liked_count', 0)})"
+        logger.info(_message)
     
     return {
         'total_notes': total_notes,
         'total_creators': total_creators,
-        'engagement': engagement[0] if engagement else {}
+        'engagement': engagement
     }
 
 
 def run_insight_analysis(keyword: str):
     """运行 InsightEngine 分析"""
-    logger.info(f"\n{'='*60}")
+    logger.info(SEP_TOP)
     logger.info("运行 InsightEngine 分析")
-    logger.info(f"{'='*60}\n")
+    logger.info(SEP_BOTTOM)
     
     try:
         from InsightEngine import create_agent
@@ -143,14 +144,11 @@ def run_insight_analysis(keyword: str):
         )
         
         logger.info("开始分析，这可能需要几分钟...")
-        report_content = agent.research(query=query, save_report=True)
-        
-        # 找到生成的报告
-        output_dir = Path(agent.config.OUTPUT_DIR)
-        report_files = sorted(output_dir.glob("*.md"), key=lambda p: p.stat().st_mtime, reverse=True)
+        result = agent.research(query=query, save_report=True)
         
-        if report_files:
-            latest_report = report_files[0]
+        # research 直接返回保存的报告路径，无需再扫描输出目录
+        latest_report = result['path']
+        if latest_report is not None:
             logger.success(f"✓ 报告已生成: {latest_report}")
             return str(latest_report)
         else:
@@ -164,14 +162,14 @@ def run_insight_analysis(keyword: str):
 
 async def main():
     parser = argparse.ArgumentParser(description="测试小红书数据读取和分析流程")
-    parser.add_argument("--keyword", "-k", required=True, help="搜索关键词")
+    parser.add_argument("--keyword", "-k", required=True, help="搜索关键词（按 source_keyword 前缀匹配）")
     parser.add_argument("--full", action="store_true", help="运行完整流程（包括 InsightEngine 分析）")
     
     args = parser.parse_args()
     
-    logger.info(f"\n{'='*60}")
+    logger.info(SEP_TOP)
     logger.info("小红书数据分析流程测试")
-    logger.info(f"{'='*60}\n")
+    logger.info(SEP_BOTTOM)
     
     # 步骤 1: 测试数据库连接
     if not await test_database_connection():
@@ -189,19 +187,24 @@ async def main():
     if args.full:
         insight_report = run_insight_analysis(args.keyword)
         if insight_report:
-            logger.success(f"\n{'='*60}")
+            logger.success(SEP_TOP)
             logger.success("✓ 完整流程测试成功！")
-            logger.success(f"{'='*60}\n")
+            logger.success(SEP_BOTTOM)
         else:
             logger.error("分析失败")
             sys.exit(1)
     else:
-        logger.success(f"\n{'='*60}")
+        logger.success(SEP_TOP)
         logger.success("✓ 数据库连接和数据查询测试成功！")
         logger.info("使用 --full 参数运行完整分析流程")
-        logger.success(f"{'='*60}\n")
+        logger.success(SEP_BOTTOM)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop  # 可选：基于 libuv 的事件循环，数据库往返的调度开销更低（不支持 Windows）
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
 
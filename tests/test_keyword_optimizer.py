@@ -0,0 +1,155 @@
+"""
+测试InsightEngine/tools/keyword_optimizer.py中的并发去重（单飞）与缓存逻辑
+
+使用桩替换 client.chat.completions.create，不发起真实的API请求，覆盖：
+1. 批量优化中的重复查询只调用一次API，且结果保持输入顺序
+2. 发起请求的任务被取消时，等待同一结果的任务走备用方案而不是收到 CancelledError
+3. 精确缓存命中时返回结果的 original_query 被替换为本次查询
+4. 网络类错误会被重试，鉴权等不可重试的错误直接走备用方案
+"""
+
+import asyncio
+import json
+import sys
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+from openai import APIConnectionError, AuthenticationError
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from InsightEngine.tools.keyword_optimizer import (
+    KEYWORD_API_RETRY_CONFIG,
+    KeywordOptimizer,
+    KeywordResponseCache,
+)
+
+_REQUEST = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+
+
+class _StubCompletions:
+    """记录调用次数的 chat.completions 桩，按原始查询回显关键词"""
+
+    def __init__(self, delay: float = 0.05, errors=()):
+        self.delay = delay
+        self.calls = []
+        # 前几次调用依次抛出的异常
+        self.errors = list(errors)
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        user_prompt = kwargs["messages"][1]["content"]
+        query = user_prompt.split("原始查询：", 1)[1].split("\n", 1)[0]
+        content = json.dumps({"keywords": [f"{query}推荐"], "reasoning": "stub"}, ensure_ascii=False)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class KeywordOptimizerSingleFlightTestCase(unittest.TestCase):
+    """单飞与缓存的回归测试"""
+
+    def setUp(self):
+        self.optimizer = KeywordOptimizer(api_key="test-key", model_name="test-model")
+        self.optimizer.cache = KeywordResponseCache(ttl_seconds=3600)
+        self.completions = _StubCompletions()
+        self.optimizer.client = SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+
+    def tearDown(self):
+        self.optimizer.close()
+
+    def test_batch_duplicates_share_one_call_and_keep_order(self):
+        queries = ["雪花秀精华", "干皮面霜", "雪花秀精华", ("雪花秀精华", "其他上下文"), "干皮面霜"]
+        results = asyncio.run(self.optimizer.optimize_keywords_batch(queries))
+
+        # 三个不同的 (查询, 上下文) 组合，各只调用一次API
+        self.assertEqual(len(self.completions.calls), 3)
+        self.assertEqual(
+            [r.original_query for r in results],
+            ["雪花秀精华", "干皮面霜", "雪花秀精华", "雪花秀精华", "干皮面霜"],
+        )
+        self.assertEqual(results[1].optimized_keywords, ["干皮面霜推荐"])
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(self.optimizer._inflight, {})
+
+    def test_waiter_falls_back_when_leader_cancelled(self):
+        self.completions.delay = 1.0
+
+        async def scenario():
+            leader = asyncio.create_task(self.optimizer._optimize_one("雪花秀精华"))
+            await asyncio.sleep(0.05)
+            waiter = asyncio.create_task(self.optimizer._optimize_one("雪花秀精华"))
+            await asyncio.sleep(0.05)
+            leader.cancel()
+            result = await waiter
+            return leader, result
+
+        # 在优化器自己的后台事件循环里执行，与真实调用路径一致
+        leader, result = self.optimizer._submit(scenario()).result(timeout=5)
+
+        self.assertTrue(leader.cancelled())
+        self.assertFalse(result.success)
+        self.assertEqual(result.original_query, "雪花秀精华")
+        self.assertTrue(result.optimized_keywords)
+        self.assertEqual(len(self.completions.calls), 1)
+        self.assertEqual(self.optimizer._inflight, {})
+
+    def test_exact_cache_hit_rewrites_original_query(self):
+        first = self.optimizer.optimize_keywords("雪花秀精华", "上下文")
+        # 把缓存条目的 original_query 改成别的值，命中后应改写为本次查询
+        cache_key, (_, cached) = next(iter(self.optimizer.cache._exact.items()))
+        self.optimizer.cache.put(cache_key, "上下文", replace(cached, original_query="旧查询"))
+
+        second = self.optimizer.optimize_keywords("雪花秀精华", "上下文")
+
+        self.assertEqual(len(self.completions.calls), 1)
+        self.assertEqual(second.original_query, "雪花秀精华")
+        self.assertEqual(second.optimized_keywords, first.optimized_keywords)
+
+
+class KeywordOptimizerRetryTestCase(unittest.TestCase):
+    """API错误重试的回归测试"""
+
+    def setUp(self):
+        # 重试配置在装饰时已绑定，这里直接把等待时间调成 0，避免测试真实退避
+        self._initial_delay = KEYWORD_API_RETRY_CONFIG.initial_delay
+        KEYWORD_API_RETRY_CONFIG.initial_delay = 0
+        self.optimizer = KeywordOptimizer(api_key="test-key", model_name="test-model")
+        self.optimizer.cache = KeywordResponseCache(ttl_seconds=0)
+
+    def tearDown(self):
+        self.optimizer.close()
+        KEYWORD_API_RETRY_CONFIG.initial_delay = self._initial_delay
+
+    def _use_stub(self, errors):
+        completions = _StubCompletions(delay=0, errors=errors)
+        self.optimizer.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        return completions
+
+    def test_connection_error_is_retried(self):
+        completions = self._use_stub([APIConnectionError(request=_REQUEST)])
+        result = self.optimizer.optimize_keywords("雪花秀精华")
+
+        self.assertEqual(len(completions.calls), 2)
+        self.assertTrue(result.success)
+        self.assertEqual(result.optimized_keywords, ["雪花秀精华推荐"])
+
+    def test_authentication_error_falls_back_without_retry(self):
+        response = httpx.Response(401, request=_REQUEST)
+        completions = self._use_stub([AuthenticationError("invalid api key", response=response, body=None)])
+        result = self.optimizer.optimize_keywords("雪花秀精华")
+
+        self.assertEqual(len(completions.calls), 1)
+        self.assertEqual(result.reasoning, "API调用失败，使用备用关键词提取")
+        self.assertEqual(result.error_message, "关键词优化服务暂时不可用")
+        self.assertTrue(result.optimized_keywords)
+
+
+if __name__ == "__main__":
+    unittest.main()
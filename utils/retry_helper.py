@@ -3,6 +3,7 @@
 提供通用的网络请求重试功能，增强系统健壮性
 """
 
+import asyncio
 import time
 from functools import wraps
 from typing import Callable, Any
@@ -198,6 +199,62 @@ def with_graceful_retry(config: RetryConfig = None, default_return=None):
         return wrapper
     return decorator
 
+def with_graceful_retry_async(config: RetryConfig = None, default_return=None):
+    """
+    优雅重试装饰器（协程版）- 用于非关键的异步API调用
+    行为与 with_graceful_retry 一致，但使用 asyncio.sleep 等待，不阻塞事件循环
+
+    Args:
+        config: 重试配置，如果不提供则使用默认配置
+        default_return: 所有重试失败后返回的默认值
+
+    Returns:
+        装饰器函数
+    """
+    if config is None:
+        config = SEARCH_API_RETRY_CONFIG
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            for attempt in range(config.max_retries + 1):  # +1 因为第一次不算重试
+                try:
+                    result = await func(*args, **kwargs)
+                    if attempt > 0:
+                        logger.info(f"非关键API {func.__name__} 在第 {attempt + 1} 次尝试后成功")
+                    return result
+
+                except config.retry_on_exceptions as e:
+                    if attempt == config.max_retries:
+                        # 最后一次尝试也失败了，返回默认值而不抛出异常
+                        logger.warning(f"非关键API {func.__name__} 在 {config.max_retries + 1} 次尝试后仍然失败")
+                        logger.warning(f"最终错误: {str(e)}")
+                        logger.info(f"返回默认值以保证系统继续运行: {default_return}")
+                        return default_return
+
+                    # 计算延迟时间
+                    delay = min(
+                        config.initial_delay * (config.backoff_factor ** attempt),
+                        config.max_delay
+                    )
+
+                    logger.warning(f"非关键API {func.__name__} 第 {attempt + 1} 次尝试失败: {str(e)}")
+                    logger.info(f"将在 {delay:.1f} 秒后进行第 {attempt + 2} 次尝试...")
+
+                    await asyncio.sleep(delay)
+
+                except Exception as e:
+                    # 不在重试列表中的异常，返回默认值
+                    logger.warning(f"非关键API {func.__name__} 遇到不可重试的异常: {str(e)}")
+                    logger.info(f"返回默认值以保证系统继续运行: {default_return}")
+                    return default_return
+
+            # 这里不应该到达，但作为安全网
+            return default_return
+
+        return wrapper
+    return decorator
+
 def make_retryable_request(
     request_func: Callable,
     *args,